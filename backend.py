@@ -1,17 +1,20 @@
 import numpy as np
 import time
+import math
 import random
+from difflib import SequenceMatcher
 from simpleai.search import SearchProblem, simulated_annealing
 
 
 
 class KnapsackProblem(SearchProblem):
-   def __init__(self, weights, values, capacity):
+   def __init__(self, weights, values, capacity, initial_state=None):
        self.weights = weights
        self.values = values
        self.capacity = capacity
-       initial_state = tuple([0 for _ in range(len(weights))])
-       super().__init__(initial_state)
+       if initial_state is None:
+           initial_state = tuple([0 for _ in range(len(weights))])
+       super().__init__(tuple(initial_state))
 
 
    def actions(self, state):
@@ -40,24 +43,39 @@ class KnapsackProblem(SearchProblem):
 
 
 
-def run_SA(weights, values, capacity, iterations_limit=5000):
-   problem = KnapsackProblem(weights, values, capacity)
+def warm_schedule(iteration):
+   """Lịch nhiệt độ thấp cho khởi động ấm: chỉ tinh chỉnh quanh lời giải cũ"""
+   return 2 * math.exp(-0.01 * iteration)
+
+
+def run_SA(weights, values, capacity, iterations_limit=5000, initial_state=None):
+   problem = KnapsackProblem(weights, values, capacity, initial_state)
    start_time = time.time()
-   result = simulated_annealing(problem, iterations_limit=iterations_limit)
+   if initial_state is None:
+       result = simulated_annealing(problem, iterations_limit=iterations_limit)
+   else:
+       result = simulated_annealing(problem, schedule=warm_schedule,
+                                    iterations_limit=iterations_limit)
    elapsed = time.time() - start_time
 
 
    best_state = result.state
+   # Khởi động ấm không bao giờ trả về lời giải kém hơn lời giải ban đầu
+   if initial_state is not None and problem.value(problem.initial_state) > problem.value(best_state):
+       best_state = problem.initial_state
    total_weight = sum(w * s for w, s in zip(weights, best_state))
    total_value = sum(v * s for v, s in zip(values, best_state))
   
    return best_state, total_value, total_weight, elapsed, iterations_limit
 
 
-def run_BCO(weights, values, capacity, num_bees=30, num_iterations=200):
+def run_BCO(weights, values, capacity, num_bees=30, num_iterations=200, initial_state=None):
    start_time = time.time()
    n = len(weights)
-   population = np.random.randint(0, 2, (num_bees, n))
+   if initial_state is None:
+       population = np.random.randint(0, 2, (num_bees, n))
+   else:
+       population = seed_population(initial_state, num_bees)
 
 
    def fitness(state):
@@ -104,10 +122,13 @@ def run_BCO(weights, values, capacity, num_bees=30, num_iterations=200):
    return tuple(best_solution), best_fitness, total_weight, elapsed, complexity
 
 
-def run_GA(weights, values, capacity, pop_size=30, generations=100, mutation_rate=0.1):
+def run_GA(weights, values, capacity, pop_size=30, generations=100, mutation_rate=0.1, initial_state=None):
    start_time = time.time()
    n = len(weights)
-   population = np.random.randint(0, 2, (pop_size, n))
+   if initial_state is None:
+       population = np.random.randint(0, 2, (pop_size, n))
+   else:
+       population = seed_population(initial_state, pop_size)
 
 
    def fitness(state):
@@ -157,6 +178,211 @@ def run_GA(weights, values, capacity, pop_size=30, generations=100, mutation_rat
    return tuple(best_solution), best_fitness, total_weight, elapsed, complexity
 
 
+def seed_population(initial_state, size):
+   """Quần thể ban đầu gồm lời giải cũ và các bản sao đột biến nhẹ của nó"""
+   base = np.array(initial_state, dtype=int)
+   n = len(base)
+   flips = np.random.rand(size, n) < 1.0 / max(n, 1)
+   flips[0] = False
+   return np.where(flips, 1 - base, base)
+
+
+# -----------------------------
+# Giải lại tăng dần (khởi động ấm khi dữ liệu bị sửa nhẹ)
+# -----------------------------
+WARM_BUDGETS = {
+   "SA": {"iterations_limit": 500},
+   "BCO": {"num_iterations": 30},
+   "GA": {"generations": 20},
+   "PT": {"num_steps": 300},
+}
+
+
+def diff_instance(old_weights, old_values, weights, values):
+   """So sánh hai bộ dữ liệu, trả về (ánh xạ chỉ số mới -> cũ, số thay đổi)
+
+   Vật phẩm được so khớp theo cặp (trọng lượng, giá trị) nên việc thêm/xóa
+   ở giữa danh sách vẫn giữ đúng các vật phẩm còn lại.
+   """
+   old_items = list(zip(old_weights, old_values))
+   new_items = list(zip(weights, values))
+   mapping = {}
+   num_edits = 0
+   matcher = SequenceMatcher(None, old_items, new_items, autojunk=False)
+   for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+       if tag == "equal":
+           for k in range(i2 - i1):
+               mapping[j1 + k] = i1 + k
+           continue
+       # Vật phẩm bị sửa: giữ vị trí tương ứng, phần dư là thêm hoặc xóa
+       for k in range(min(i2 - i1, j2 - j1)):
+           mapping[j1 + k] = i1 + k
+       num_edits += max(i2 - i1, j2 - j1)
+   return mapping, num_edits
+
+
+def repair_state(state, weights, values, capacity):
+   """Sửa lời giải cho vừa sức chứa rồi lấp đầy tham lam theo tỷ lệ V/W"""
+   state = list(state)
+   by_ratio = sorted(range(len(weights)), key=lambda i: values[i] / weights[i])
+   total_weight = sum(w * s for w, s in zip(weights, state))
+   # Bỏ các vật phẩm có tỷ lệ V/W thấp nhất cho tới khi không quá tải
+   for i in by_ratio:
+       if total_weight <= capacity:
+           break
+       if state[i]:
+           state[i] = 0
+           total_weight -= weights[i]
+   # Thêm các vật phẩm có tỷ lệ V/W cao nhất nếu còn chỗ
+   for i in reversed(by_ratio):
+       if not state[i] and total_weight + weights[i] <= capacity:
+           state[i] = 1
+           total_weight += weights[i]
+   return tuple(state)
+
+
+class WarmStartCache:
+   """Lưu bộ dữ liệu và lời giải tốt nhất gần nhất của từng thuật toán"""
+   def __init__(self, max_edits=3):
+       self.max_edits = max_edits
+       self.entries = {}  # algorithm -> (weights, values, capacity, state)
+
+
+   def record(self, algorithm, weights, values, capacity, state):
+       self.entries[algorithm] = (list(weights), list(values), capacity,
+                                  tuple(int(s) for s in state))
+
+
+   def warm_start(self, algorithm, weights, values, capacity):
+       """Trả về lời giải khởi động ấm sau chỉnh sửa nhỏ, ngược lại trả về None"""
+       entry = self.entries.get(algorithm)
+       if entry is None or not weights:
+           return None
+       old_weights, old_values, old_capacity, old_state = entry
+       mapping, num_edits = diff_instance(old_weights, old_values, weights, values)
+       if capacity != old_capacity:
+           num_edits += 1
+       # Dữ liệu không đổi: chạy lại tìm kiếm đầy đủ; thay đổi quá nhiều: khởi động nguội
+       if num_edits == 0 or num_edits > max(self.max_edits, len(weights) // 4):
+           return None
+       state = [old_state[mapping[j]] if j in mapping else 0 for j in range(len(weights))]
+       return repair_state(state, weights, values, capacity)
+
+
+# -----------------------------
+# Parallel tempering (nhiều chuỗi SA chạy theo lô NumPy)
+# -----------------------------
+def run_PT(weights, values, capacity, num_replicas=8, num_steps=2000, t_min=0.01, t_max=1.0,
+          swap_interval=10, initial_state=None):
+   """Parallel tempering: K chuỗi SA ở thang nhiệt độ khác nhau, chạy theo lô NumPy"""
+   start_time = time.time()
+   w_arr = np.array(weights, dtype=float)
+   v_arr = np.array(values, dtype=float)
+   n = len(weights)
+   if n == 0:
+       stats = {"temperatures": [], "acceptance_rates": [], "swap_rates": []}
+       return (), 0.0, 0.0, time.time() - start_time, 0, stats
+   rows = np.arange(num_replicas)
+   # Nhiệt độ theo cấp số nhân, tỷ lệ với giá trị trung bình của vật phẩm
+   temperatures = np.geomspace(t_min, t_max, num_replicas) * v_arr.mean()
+
+
+   def fitness(total_weight, total_value):
+       return total_value - np.maximum(total_weight - capacity, 0) * 10
+
+
+   if initial_state is None:
+       states = np.random.randint(0, 2, (num_replicas, n))
+   else:
+       states = np.tile(np.array(initial_state, dtype=int), (num_replicas, 1))
+   total_weights = states @ w_arr
+   total_values = states @ v_arr
+   fitness_values = fitness(total_weights, total_values)
+
+
+   # Ưu tiên lời giải hợp lệ tốt nhất; lời giải phạt tốt nhất chỉ là dự phòng
+   best_feasible = None
+   best_feasible_value = -np.inf
+   best_solution = None
+   best_fitness = -np.inf
+
+
+   def update_best():
+       nonlocal best_feasible, best_feasible_value, best_solution, best_fitness
+       feasible_values = np.where(total_weights <= capacity, total_values, -np.inf)
+       idx = np.argmax(feasible_values)
+       if feasible_values[idx] > best_feasible_value:
+           best_feasible_value = feasible_values[idx]
+           best_feasible = states[idx].copy()
+       idx = np.argmax(fitness_values)
+       if fitness_values[idx] > best_fitness:
+           best_fitness = fitness_values[idx]
+           best_solution = states[idx].copy()
+
+
+   update_best()
+
+
+   accepted = np.zeros(num_replicas, dtype=int)
+   swap_attempts = np.zeros(max(num_replicas - 1, 0), dtype=int)
+   swap_accepted = np.zeros(max(num_replicas - 1, 0), dtype=int)
+
+
+   for step in range(1, num_steps + 1):
+       # Lật một bit ở mỗi chuỗi, tính độ chênh lệch mà không tính lại toàn bộ
+       flips = np.random.randint(0, n, num_replicas)
+       signs = 1 - 2 * states[rows, flips]
+       new_weights = total_weights + signs * w_arr[flips]
+       new_values = total_values + signs * v_arr[flips]
+       new_fitness = fitness(new_weights, new_values)
+       delta = new_fitness - fitness_values
+       accept = np.random.rand(num_replicas) < np.exp(np.minimum(delta, 0) / temperatures)
+
+
+       states[rows[accept], flips[accept]] ^= 1
+       total_weights = np.where(accept, new_weights, total_weights)
+       total_values = np.where(accept, new_values, total_values)
+       fitness_values = np.where(accept, new_fitness, fitness_values)
+       accepted += accept
+
+
+       update_best()
+
+
+       # Hoán đổi trạng thái giữa các cặp nhiệt độ kề nhau (xen kẽ cặp chẵn/lẻ)
+       if num_replicas > 1 and step % swap_interval == 0:
+           low = np.arange((step // swap_interval) % 2, num_replicas - 1, 2)
+           high = low + 1
+           log_ratio = (1 / temperatures[low] - 1 / temperatures[high]) * \
+                       (fitness_values[high] - fitness_values[low])
+           swap = np.random.rand(len(low)) < np.exp(np.minimum(log_ratio, 0))
+           swap_attempts[low] += 1
+           swap_accepted[low] += swap
+           perm = np.arange(num_replicas)
+           perm[low[swap]] = high[swap]
+           perm[high[swap]] = low[swap]
+           states = states[perm]
+           total_weights = total_weights[perm]
+           total_values = total_values[perm]
+           fitness_values = fitness_values[perm]
+
+
+   if best_feasible is not None:
+       best_solution = best_feasible
+   elapsed = time.time() - start_time
+   total_weight = np.sum(w_arr * best_solution)
+   total_value = np.sum(v_arr * best_solution)
+
+
+   stats = {
+       "temperatures": temperatures.tolist(),
+       "acceptance_rates": (accepted / np.maximum(num_steps, 1)).tolist(),
+       "swap_rates": (swap_accepted / np.maximum(swap_attempts, 1)).tolist(),
+   }
+   complexity = num_replicas * num_steps
+   return tuple(int(s) for s in best_solution), total_value, total_weight, elapsed, complexity, stats
+
+
 
 def random_dataset():
    """Tạo dữ liệu ngẫu nhiên cho bài toán Knapsack"""
@@ -0,0 +1,32 @@
+import os
+import re
+import subprocess
+import sys
+import statistics
+
+
+def measure_startup(runs=5):
+   """Chạy main.py nhiều lần (tiến trình mới) và đo thời gian tới lần vẽ đầu tiên"""
+   main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+   times = []
+   for _ in range(runs):
+       output = subprocess.run([sys.executable, main_path, "--startup-benchmark"],
+                               capture_output=True, text=True, timeout=60).stdout
+       match = re.search(r"time_to_first_paint=([0-9.]+)", output)
+       if not match:
+           raise RuntimeError(f"Không đo được thời gian khởi động:\n{output}")
+       times.append(float(match.group(1)))
+   return times
+
+
+def main():
+   runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+   times = measure_startup(runs)
+   print(f"Số lần chạy: {runs}")
+   print(f"Time-to-first-paint nhỏ nhất: {min(times):.4f} giây")
+   print(f"Time-to-first-paint trung vị: {statistics.median(times):.4f} giây")
+   print(f"Time-to-first-paint lớn nhất: {max(times):.4f} giây")
+
+
+if __name__ == "__main__":
+   main()
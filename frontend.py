@@ -1,4 +1,5 @@
 import sys
+import time
 import threading
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QTabWidget, QLabel, QLineEdit,
@@ -7,19 +8,20 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QMessageBox, QHeaderView, QFrame, QSplitter)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import numpy as np
 
 
-# Import logic nghiệp vụ từ Backend
-# Đảm bảo file knapsack_backend.py nằm cùng thư mục
-try:
-   from backend import run_SA, run_BCO, run_GA, random_dataset
-except ImportError:
-   print("Lỗi: Không tìm thấy file knapsack_backend.py. Vui lòng đảm bảo đã tạo file đó.")
-   sys.exit(1)
+# Matplotlib, NumPy và simpleai (qua backend) được import khi cần lần đầu
+# để cửa sổ hiện ra nhanh; backend được nạp trước ở luồng nền sau khi vẽ xong.
+def load_backend():
+   """Import logic nghiệp vụ từ Backend (chỉ import thật ở lần gọi đầu)"""
+   # Đảm bảo file backend.py nằm cùng thư mục; lỗi được báo qua QMessageBox ở nơi gọi
+   import backend
+   return backend
+
+
+# Thứ tự thuật toán trong chế độ "ALL": phải khớp với bộ kết quả AlgorithmWorker phát ra
+ALL_CODES = ["SA", "BCO", "GA"]
+WARM_NOTE = "Khởi động ấm từ lời giải trước với ngân sách ngắn - thời gian và độ phức tạp không so sánh được với lần chạy đầy đủ"
 
 
 
@@ -27,12 +29,22 @@ except ImportError:
 # -----------------------------
 # Helper Widgets (Frontend components)
 # -----------------------------
-class MplCanvas(FigureCanvas):
-   """Widget để nhúng Matplotlib vào PyQt5"""
+class MplCanvas(QWidget):
+   """Widget để nhúng Matplotlib vào PyQt5 (matplotlib chỉ được import khi tạo)"""
    def __init__(self, parent=None, width=5, height=4, dpi=100):
+       super().__init__(parent)
+       from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+       from matplotlib.figure import Figure
        self.fig = Figure(figsize=(width, height), dpi=dpi)
-       super().__init__(self.fig)
-       self.setParent(parent)
+       self.figure_canvas = FigureCanvas(self.fig)
+       layout = QVBoxLayout()
+       layout.setContentsMargins(0, 0, 0, 0)
+       layout.addWidget(self.figure_canvas)
+       self.setLayout(layout)
+
+
+   def draw(self):
+       self.figure_canvas.draw()
 
 
 # -----------------------------
@@ -43,30 +55,43 @@ class AlgorithmWorker(QThread):
    finished = pyqtSignal(str, object)  # algorithm_name, result
    error = pyqtSignal(str)             # error message
   
-   def __init__(self, algorithm, weights, values, capacity):
+   def __init__(self, algorithm, weights, values, capacity, warm_states=None):
        super().__init__()
        self.algorithm = algorithm
        self.weights = weights
        self.values = values
        self.capacity = capacity
+       self.warm_states = warm_states or {}  # algorithm -> lời giải khởi động ấm
+
+
+   def solve(self, algorithm, runner_name):
+       """Gọi hàm backend, khởi động ấm với ngân sách ngắn nếu có lời giải cũ"""
+       backend = load_backend()
+       runner = getattr(backend, runner_name)
+       initial_state = self.warm_states.get(algorithm)
+       if initial_state is None:
+           return runner(self.weights, self.values, self.capacity)
+       return runner(self.weights, self.values, self.capacity,
+                     initial_state=initial_state, **backend.WARM_BUDGETS[algorithm])
       
    def run(self):
        """Chạy logic nghiệp vụ (run_XXX) trong luồng nền"""
        try:
            if self.algorithm == "SA":
-               result = run_SA(self.weights, self.values, self.capacity)
+               result = self.solve("SA", "run_SA")
                self.finished.emit("Simulated Annealing", result)
            elif self.algorithm == "BCO":
-               result = run_BCO(self.weights, self.values, self.capacity)
+               result = self.solve("BCO", "run_BCO")
                self.finished.emit("Bee Colony Optimization", result)
            elif self.algorithm == "GA":
-               result = run_GA(self.weights, self.values, self.capacity)
+               result = self.solve("GA", "run_GA")
                self.finished.emit("Genetic Algorithm", result)
+           elif self.algorithm == "PT":
+               result = self.solve("PT", "run_PT")
+               self.finished.emit("Parallel Tempering", result)
            elif self.algorithm == "ALL":
-               sa_result = run_SA(self.weights, self.values, self.capacity)
-               bco_result = run_BCO(self.weights, self.values, self.capacity)
-               ga_result = run_GA(self.weights, self.values, self.capacity)
-               self.finished.emit("ALL", (sa_result, bco_result, ga_result))
+               results = tuple(self.solve(code, f"run_{code}") for code in ALL_CODES)
+               self.finished.emit("ALL", results)
        except Exception as e:
            # Phát tín hiệu lỗi ra giao diện
            self.error.emit(str(e))
@@ -77,6 +102,8 @@ class AlgorithmWorker(QThread):
 # -----------------------------
 class KnapsackGUI(QMainWindow):
    """Cửa sổ chính của ứng dụng Knapsack Solver"""
+   first_painted = pyqtSignal(float)  # thời điểm vẽ lần đầu (time.perf_counter)
+  
    def __init__(self):
        super().__init__()
        # Data Model (Tối thiểu, giữ ở Frontend để cập nhật giao diện)
@@ -85,6 +112,10 @@ class KnapsackGUI(QMainWindow):
        self.capacity = 0
        self.worker = None
        self.last_results = None
+       # Bộ dữ liệu và lời giải gần nhất, dùng để giải lại tăng dần (tạo khi chạy lần đầu)
+       self.warm_cache = None
+       self.first_paint_time = None
+       self.preload_thread = None
       
        self.init_ui()
       
@@ -113,16 +144,43 @@ class KnapsackGUI(QMainWindow):
       
        self.create_data_input_tab()
        self.create_algorithm_tab()
-       self.create_results_tab()
+       # Tab Kết Quả (và MplCanvas) chỉ được dựng khi người dùng mở lần đầu
+       self.results_tab = QWidget()
+       self.results_tab_built = False
       
        self.tab_widget.addTab(self.data_tab, "Nhập Dữ Liệu")
        self.tab_widget.addTab(self.algorithm_tab, "Chạy Thuật Toán")
        self.tab_widget.addTab(self.results_tab, "Kết Quả & Biểu Đồ")
+       self.tab_widget.currentChanged.connect(self.on_tab_changed)
       
        main_layout = QVBoxLayout()
        main_layout.addWidget(self.tab_widget)
        central_widget.setLayout(main_layout)
       
+   def paintEvent(self, event):
+       super().paintEvent(event)
+       if self.first_paint_time is None:
+           self.first_paint_time = time.perf_counter()
+           # Chờ vòng lặp sự kiện rảnh rồi mới nạp trước backend
+           QTimer.singleShot(0, self.preload_backend)
+           self.first_painted.emit(self.first_paint_time)
+      
+   def preload_backend(self):
+       """Nạp trước backend (NumPy, simpleai) ở luồng nền sau khi cửa sổ hiện ra"""
+       self.preload_thread = threading.Thread(target=self._preload_backend, daemon=True)
+       self.preload_thread.start()
+      
+   def _preload_backend(self):
+       try:
+           load_backend()
+       except Exception:
+           # Lỗi sẽ được báo lại khi người dùng thực sự cần tới backend
+           pass
+      
+   def on_tab_changed(self, index):
+       if self.tab_widget.widget(index) is self.results_tab and not self.results_tab_built:
+           self.create_results_tab()
+      
    def create_data_input_tab(self):
        # ... (Toàn bộ logic tạo giao diện cho tab Nhập Dữ Liệu) ...
        self.data_tab = QWidget()
@@ -202,12 +260,16 @@ class KnapsackGUI(QMainWindow):
        self.ga_btn = QPushButton("Genetic Algorithm")
        self.ga_btn.clicked.connect(lambda: self.run_algorithm("GA"))
        self.ga_btn.setStyleSheet("background-color: #4CAF50; font-size: 12px; padding: 8px;")
+       self.pt_btn = QPushButton("Parallel Tempering")
+       self.pt_btn.clicked.connect(lambda: self.run_algorithm("PT"))
+       self.pt_btn.setStyleSheet("background-color: #00BCD4; font-size: 12px; padding: 8px;")
        self.all_btn = QPushButton("So Sánh Tất Cả")
        self.all_btn.clicked.connect(lambda: self.run_algorithm("ALL"))
        self.all_btn.setStyleSheet("background-color: #F44336; font-size: 12px; padding: 8px;")
        selection_layout.addWidget(self.sa_btn)
        selection_layout.addWidget(self.bco_btn)
        selection_layout.addWidget(self.ga_btn)
+       selection_layout.addWidget(self.pt_btn)
        selection_layout.addWidget(self.all_btn)
        selection_group.setLayout(selection_layout)
        layout.addWidget(selection_group)
@@ -234,7 +296,8 @@ class KnapsackGUI(QMainWindow):
       
    def create_results_tab(self):
        # ... (Toàn bộ logic tạo giao diện cho tab Kết Quả & Biểu Đồ) ...
-       self.results_tab = QWidget()
+       # Dựng vào widget giữ chỗ self.results_tab đã có sẵn trong QTabWidget
+       self.results_tab_built = True
        layout = QVBoxLayout()
        title_label = QLabel("KẾT QUẢ VÀ BIỂU ĐỒ")
        title_label.setAlignment(Qt.AlignCenter)
@@ -325,7 +388,12 @@ class KnapsackGUI(QMainWindow):
 
    def generate_random_data(self):
        # Gọi hàm backend để tạo dữ liệu ngẫu nhiên
-       self.weights, self.values, self.capacity = random_dataset()
+       try:
+           backend = load_backend()
+       except Exception as e:
+           QMessageBox.critical(self, "Lỗi", f"Không thể nạp backend: {e}")
+           return
+       self.weights, self.values, self.capacity = backend.random_dataset()
        self.update_data_display()
        QMessageBox.information(self, "Thành công", "Dữ liệu ngẫu nhiên đã được tạo!")
 
@@ -353,18 +421,34 @@ class KnapsackGUI(QMainWindow):
        if not self.weights:
            QMessageBox.warning(self, "Lỗi", "Vui lòng nhập dữ liệu trước khi chạy thuật toán!")
            return
+       if self.warm_cache is None:
+           try:
+               self.warm_cache = load_backend().WarmStartCache()
+           except Exception as e:
+               QMessageBox.critical(self, "Lỗi", f"Không thể nạp backend: {e}")
+               return
           
        self.sa_btn.setEnabled(False)
        self.bco_btn.setEnabled(False)
        self.ga_btn.setEnabled(False)
+       self.pt_btn.setEnabled(False)
        self.all_btn.setEnabled(False)
       
        self.progress_bar.setVisible(True)
        self.progress_bar.setRange(0, 0)
-       self.progress_label.setText(f"Đang chạy thuật toán {algorithm}...")
+       codes = ALL_CODES if algorithm == "ALL" else [algorithm]
+       warm_states = {}
+       for code in codes:
+           state = self.warm_cache.warm_start(code, self.weights, self.values, self.capacity)
+           if state is not None:
+               warm_states[code] = state
+       if warm_states:
+           self.progress_label.setText(f"Đang chạy thuật toán {algorithm} (khởi động ấm)...")
+       else:
+           self.progress_label.setText(f"Đang chạy thuật toán {algorithm}...")
       
        # Khởi tạo và chạy luồng Worker
-       self.worker = AlgorithmWorker(algorithm, self.weights, self.values, self.capacity)
+       self.worker = AlgorithmWorker(algorithm, self.weights, self.values, self.capacity, warm_states)
        self.worker.finished.connect(self.on_algorithm_finished)
        self.worker.error.connect(self.on_algorithm_error)
        self.worker.start()
@@ -373,20 +457,30 @@ class KnapsackGUI(QMainWindow):
        self.sa_btn.setEnabled(True)
        self.bco_btn.setEnabled(True)
        self.ga_btn.setEnabled(True)
+       self.pt_btn.setEnabled(True)
        self.all_btn.setEnabled(True)
       
        self.progress_bar.setVisible(False)
        self.progress_label.setText("Hoàn thành!")
       
+       # Ghi nhớ lời giải để lần chạy sau khởi động ấm
+       worker = self.worker
+       if algorithm_name == "ALL":
+           for code, code_result in zip(ALL_CODES, result):
+               self.warm_cache.record(code, worker.weights, worker.values, worker.capacity, code_result[0])
+       else:
+           self.warm_cache.record(worker.algorithm, worker.weights, worker.values, worker.capacity, result[0])
+      
        if algorithm_name == "ALL":
-           self.display_comparison_results(result)
+           self.display_comparison_results(result, worker.warm_states)
        else:
-           self.display_single_result(algorithm_name, result)
+           self.display_single_result(algorithm_name, result, worker.algorithm in worker.warm_states)
           
    def on_algorithm_error(self, error_msg):
        self.sa_btn.setEnabled(True)
        self.bco_btn.setEnabled(True)
        self.ga_btn.setEnabled(True)
+       self.pt_btn.setEnabled(True)
        self.all_btn.setEnabled(True)
       
        self.progress_bar.setVisible(False)
@@ -394,12 +488,14 @@ class KnapsackGUI(QMainWindow):
       
        QMessageBox.critical(self, "Lỗi", f"Có lỗi xảy ra: {error_msg}")
       
-   def display_single_result(self, algorithm_name, result):
+   def display_single_result(self, algorithm_name, result, warm=False):
        # ... (Logic hiển thị kết quả chi tiết) ...
-       state, value, weight, time_taken, complexity = result
+       state, value, weight, time_taken, complexity = result[:5]
        self.results_display.clear()
        self.results_display.append(f"KẾT QUẢ {algorithm_name.upper()}")
        self.results_display.append("=" * 50)
+       if warm:
+           self.results_display.append(f"({WARM_NOTE})")
        self.results_display.append(f"Giá trị tối ưu: {value:.2f}")
        self.results_display.append(f"Trọng lượng: {weight:.2f}")
        self.results_display.append(f"Thời gian thực thi: {time_taken:.4f} giây")
@@ -413,11 +509,20 @@ class KnapsackGUI(QMainWindow):
            self.results_display.append("\n".join(f"• {item}" for item in selected_items))
        else:
            self.results_display.append("Không có vật phẩm nào được chọn.")
+       if len(result) > 5:
+           # Thống kê của từng chuỗi (Parallel Tempering)
+           stats = result[5]
+           self.results_display.append("\nThống kê từng chuỗi:")
+           self.results_display.append("-" * 30)
+           for i, (temp, rate) in enumerate(zip(stats["temperatures"], stats["acceptance_rates"])):
+               self.results_display.append(f"Chuỗi {i+1}: T={temp:.2f}, tỷ lệ chấp nhận={rate:.2%}")
+           for i, rate in enumerate(stats["swap_rates"]):
+               self.results_display.append(f"Hoán đổi {i+1}<->{i+2}: {rate:.2%}")
           
-   def display_comparison_results(self, results):
+   def display_comparison_results(self, results, warm_states=None):
        # ... (Logic hiển thị bảng so sánh) ...
        sa_result, bco_result, ga_result = results
-       self.last_results = results # Lưu kết quả để vẽ biểu đồ
+       self.last_results = (results, warm_states or {}) # Lưu kết quả (và cờ khởi động ấm) để vẽ biểu đồ
       
        self.results_display.clear()
        self.results_display.append("BẢNG SO SÁNH KẾT QUẢ")
@@ -426,12 +531,16 @@ class KnapsackGUI(QMainWindow):
        self.results_display.append("-" * 80)
       
        algorithms = [("Simulated Annealing", sa_result), ("Bee Colony Optimization", bco_result), ("Genetic Algorithm", ga_result)]
+       warm_states = warm_states or {}
       
-       for name, result in algorithms:
+       for code, (name, result) in zip(ALL_CODES, algorithms):
            state, value, weight, time_taken, complexity = result
-           self.results_display.append(f"{name:<25}{value:<12.2f}{weight:<15.2f}{time_taken:<15.4f}{complexity:<15}")
+           label = f"{name}*" if code in warm_states else name
+           self.results_display.append(f"{label:<25}{value:<12.2f}{weight:<15.2f}{time_taken:<15.4f}{complexity:<15}")
           
        self.results_display.append("=" * 80)
+       if warm_states:
+           self.results_display.append(f"* {WARM_NOTE}")
        best_value = max(sa_result[1], bco_result[1], ga_result[1])
        best_algo = next(name for name, result in algorithms if result[1] == best_value)
        self.results_display.append(f"\nThuật toán tốt nhất: **{best_algo}** với giá trị **{best_value:.2f}**")
@@ -443,7 +552,7 @@ class KnapsackGUI(QMainWindow):
        if not self.last_results:
            QMessageBox.warning(self, "Cảnh báo", "Vui lòng chạy thuật toán trước khi vẽ biểu đồ!")
            return
-       sa_result, bco_result, ga_result = self.last_results
+       (sa_result, bco_result, ga_result), _ = self.last_results
        algorithms = ['Simulated\nAnnealing', 'Bee Colony\nOptimization', 'Genetic\nAlgorithm']
        values = [sa_result[1], bco_result[1], ga_result[1]]
       
@@ -469,8 +578,9 @@ class KnapsackGUI(QMainWindow):
        if not self.last_results:
            QMessageBox.warning(self, "Cảnh báo", "Vui lòng chạy thuật toán trước khi vẽ biểu đồ!")
            return
-       sa_result, bco_result, ga_result = self.last_results
-       algorithms = ['Simulated\nAnnealing', 'Bee Colony\nOptimization', 'Genetic\nAlgorithm']
+       (sa_result, bco_result, ga_result), warm_states = self.last_results
+       warm_flags = [code in warm_states for code in ALL_CODES]
+       algorithms = self.warm_tick_labels(['Simulated\nAnnealing', 'Bee Colony\nOptimization', 'Genetic\nAlgorithm'], warm_flags)
        times = [sa_result[3], bco_result[3], ga_result[3]]
       
        self.canvas.fig.clear()
@@ -485,7 +595,11 @@ class KnapsackGUI(QMainWindow):
        ax.set_ylabel('Thời Gian (giây)', fontsize=12)
        ax.set_xlabel('Thuật Toán', fontsize=12)
        ax.grid(True, alpha=0.3)
-       bars[times.index(min(times))].set_color('#00BCD4')
+       # Chỉ tô nổi bật trong các lần chạy đầy đủ, cột khởi động ấm được gạch chéo
+       cold_times = [t for t, warm in zip(times, warm_flags) if not warm]
+       if cold_times:
+           bars[times.index(min(cold_times))].set_color('#00BCD4')
+       self.mark_warm_bars(ax, bars, warm_flags)
       
        self.canvas.fig.tight_layout()
        self.canvas.draw()
@@ -496,8 +610,9 @@ class KnapsackGUI(QMainWindow):
        if not self.last_results:
            QMessageBox.warning(self, "Cảnh báo", "Vui lòng chạy thuật toán trước khi vẽ biểu đồ!")
            return
-       sa_result, bco_result, ga_result = self.last_results
-       algorithms = ['Simulated\nAnnealing', 'Bee Colony\nOptimization', 'Genetic\nAlgorithm']
+       (sa_result, bco_result, ga_result), warm_states = self.last_results
+       warm_flags = [code in warm_states for code in ALL_CODES]
+       algorithms = self.warm_tick_labels(['Simulated\nAnnealing', 'Bee Colony\nOptimization', 'Genetic\nAlgorithm'], warm_flags)
        efficiency = []
        for result in [sa_result, bco_result, ga_result]:
            efficiency.append(result[1] / result[3] if result[3] > 0 else 0)
@@ -514,11 +629,27 @@ class KnapsackGUI(QMainWindow):
        ax.set_ylabel('Hiệu Suất (Giá Trị/Thời Gian)', fontsize=12)
        ax.set_xlabel('Thuật Toán', fontsize=12)
        ax.grid(True, alpha=0.3)
-       bars[efficiency.index(max(efficiency))].set_color('#8BC34A')
+       cold_efficiency = [e for e, warm in zip(efficiency, warm_flags) if not warm]
+       if cold_efficiency:
+           bars[efficiency.index(max(cold_efficiency))].set_color('#8BC34A')
+       self.mark_warm_bars(ax, bars, warm_flags)
       
        self.canvas.fig.tight_layout()
        self.canvas.draw()
       
+   def warm_tick_labels(self, labels, warm_flags):
+       """Thêm dấu * vào nhãn của các thuật toán được khởi động ấm"""
+       return [f"{label}*" if warm else label for label, warm in zip(labels, warm_flags)]
+      
+   def mark_warm_bars(self, ax, bars, warm_flags):
+       """Gạch chéo các cột khởi động ấm và ghi chú dưới trục hoành"""
+       if not any(warm_flags):
+           return
+       for bar, warm in zip(bars, warm_flags):
+           if warm:
+               bar.set_hatch('//')
+       ax.set_xlabel(f"{ax.get_xlabel()}\n* {WARM_NOTE}", fontsize=12)
+      
    def clear_plot(self):
        # ... (Logic xóa biểu đồ) ...
        self.canvas.fig.clear()
@@ -1,19 +1,33 @@
+import time
+START_TIME = time.perf_counter()  # Đo thời gian khởi động từ trước khi import Qt
+
+
 import sys
 from PyQt5.QtWidgets import QApplication
 from frontend import KnapsackGUI
 
 
+def report_first_paint(app, first_paint_time):
+   """In thời gian từ lúc khởi động tới lần vẽ đầu tiên rồi thoát (chế độ benchmark)"""
+   print(f"time_to_first_paint={first_paint_time - START_TIME:.4f}")
+   sys.stdout.flush()
+   app.quit()
+
+
 def main():
+   benchmark = "--startup-benchmark" in sys.argv
    app = QApplication(sys.argv)
   
    app.setApplicationName("Knapsack Problem Solver")
    app.setApplicationVersion("1.0")
   
    window = KnapsackGUI()
+   if benchmark:
+       window.first_painted.connect(lambda t: report_first_paint(app, t))
    window.show()
   
    sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
-   main()
\ No newline at end of file
+   main()